@@ -1,8 +1,11 @@
 # File: ai_translator/config.py
 import argparse
+import atexit
 import logging
 import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
 from colorlog import ColoredFormatter
@@ -17,8 +20,7 @@ DEFAULT_API_DELAY_S: float = 0.0
 DEFAULT_WORKERS: int = 8
 
 
-def setup_logging(log_file: str = "processing.log") -> None:
-    # ... (function remains unchanged)
+def setup_logging(log_file: str = "processing.log", single_worker: bool = True) -> None:
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.DEBUG)
     if root_logger.hasHandlers():
@@ -27,7 +29,6 @@ def setup_logging(log_file: str = "processing.log") -> None:
     file_handler = logging.FileHandler(log_file)
     file_handler.setLevel(logging.INFO)
     file_handler.setFormatter(file_formatter)
-    root_logger.addHandler(file_handler)
     log_colors = {
         'DEBUG': 'white', 'INFO': 'green', 'WARNING': 'yellow',
         'ERROR': 'red', 'CRITICAL': 'bold_red',
@@ -37,14 +38,32 @@ def setup_logging(log_file: str = "processing.log") -> None:
         log_colors=log_colors
     )
 
-    # --- FIX: Use the correct imported class name ---
-    # This integrates logging with the tqdm progress bar to prevent deadlocks
-    console_handler = _TqdmLoggingHandler()
-    # --- End FIX ---
+    if single_worker and sys.stderr.isatty():
+        # --- FIX: Use the correct imported class name ---
+        # This integrates logging with the tqdm progress bar to prevent deadlocks
+        console_handler = _TqdmLoggingHandler()
+        # --- End FIX ---
+        console_handler.setLevel(logging.DEBUG)
+        console_handler.setFormatter(console_formatter)
+        root_logger.addHandler(file_handler)
+        root_logger.addHandler(console_handler)
+        return
 
+    # Multi-worker runs: the tqdm-aware handler would serialize every
+    # worker thread on the tqdm lock per record. Instead, workers enqueue
+    # records into a thread-safe queue and one background listener thread
+    # does the actual console/file writes.
+    console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.DEBUG)
     console_handler.setFormatter(console_formatter)
-    root_logger.addHandler(console_handler)
+
+    log_queue: "queue.Queue" = queue.Queue(-1)
+    listener = QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+    root_logger.addHandler(QueueHandler(log_queue))
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -86,6 +105,15 @@ def parse_arguments() -> argparse.Namespace:
         "--api-delay", type=float, default=DEFAULT_API_DELAY_S,
         help="Delay in seconds between API calls."
     )
+    parser.add_argument(
+        "--api-batch-size", type=int, default=1,
+        help="Items to pack into a single API request (1 = one call per item)."
+    )
+    parser.add_argument(
+        "--file-workers", type=int, default=1,
+        help="Files to process in parallel worker processes "
+             "(progress bars may interleave when > 1)."
+    )
     parser.add_argument(
         "--model", type=str, default=os.getenv("AI_MODEL_NAME", "qwen/qwen3-8b"),
         help="The model name for the API request."
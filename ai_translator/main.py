@@ -1,77 +1,186 @@
 # File: ai_translator/main.py
 import logging
-import shutil
+import os
 import sys
 import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from pathlib import Path
-from typing import List
+from typing import FrozenSet, Optional
 
 from dotenv import load_dotenv
 
 from ai_translator.config import parse_arguments, setup_logging
-from ai_translator.processing import FileProcessor
+from ai_translator.processing import FileProcessor, process_file_standalone
+from ai_translator.utils import load_system_prompt, move_file
 
 
-def _get_files(directory: Path) -> List[Path]:
-    """Helper to get sorted .json files."""
-    return sorted(
-        [f for f in directory.iterdir() if f.is_file() and f.suffix == ".json"]
-    )
+# Directories already created in this process; lets the job loop skip the
+# stat+mkdir syscall pair after the first pass.
+_dirs_ready: "set[Path]" = set()
+
+
+def _ensure_dir(directory: Path) -> None:
+    """mkdir(exist_ok=True), but only once per directory per process."""
+    if directory not in _dirs_ready:
+        directory.mkdir(exist_ok=True)
+        _dirs_ready.add(directory)
+
+
+def _get_first_file(directory: Path, busy: FrozenSet[str] = frozenset()) -> Optional[Path]:
+    """Returns the alphabetically first .json file, or None if there is none.
+
+    The job loop only ever takes one file at a time, so an O(n) min over
+    raw entry paths replaces sorting the whole directory. os.scandir
+    reuses the dirent data for is_file(), avoiding one stat syscall per
+    entry compared to Path.iterdir() + Path.is_file(). `busy` holds file
+    names already claimed by in-flight workers, which must not be
+    re-claimed while they sit in the processing directory.
+    """
+    with os.scandir(directory) as it:
+        first = min(
+            (
+                entry.path
+                for entry in it
+                if entry.name.endswith(".json")
+                and entry.name not in busy
+                and entry.is_file()
+            ),
+            default=None,
+        )
+    return Path(first) if first is not None else None
+
+
+# Sentinel returned by _claim_next_job when a claim failed and the caller
+# should simply re-scan instead of shutting down.
+_RETRY = object()
+
+
+def _claim_next_job(args, busy: FrozenSet[str] = frozenset()) -> "Optional[Path]":
+    """Single sweep over both job directories, returning a processing path.
+
+    Interrupted jobs in the processing directory win; otherwise the next
+    todo file is moved into processing. Returns None when both directories
+    are empty, or the _RETRY sentinel when a move failed. Files named in
+    `busy` (in flight in another worker) are never claimed.
+    """
+    # 1. Prioritize any job already in the processing directory
+    interrupted_path = _get_first_file(args.processing_dir, busy)
+    if interrupted_path:
+        logging.info(f"Found interrupted job {interrupted_path.name}. Resuming it.")
+        return interrupted_path
+
+    # 2. Claim a new job from the todo directory (a todo file whose name
+    # is currently busy would overwrite the in-flight copy on move)
+    source_path = _get_first_file(args.todo_dir, busy)
+    if source_path:
+        logging.info(f"Found new job {source_path.name}. Starting it.")
+        processing_path = args.processing_dir / source_path.name
+        try:
+            move_file(source_path, processing_path)
+            logging.info(f"Moved {source_path.name} to processing directory.")
+        except (IOError, OSError) as e:
+            logging.error(f"Could not move {source_path.name} to processing: {e}")
+            time.sleep(1)  # Wait a second if move failed (e.g. file lock)
+            return _RETRY
+        return processing_path
+
+    return None
+
+
+def _init_file_worker() -> None:
+    """Re-initializes logging inside a file-worker process.
+
+    The parent's QueueListener thread does not survive the fork, so each
+    worker process gets its own listener; without this, child log records
+    would pile up in a queue nobody drains.
+    """
+    setup_logging(single_worker=False)
+
+
+def _run_multi_file(args, system_prompt: str) -> None:
+    """Processes up to --file-workers files concurrently, one per process.
+
+    Two-level parallelism: each worker process still runs its own tuned
+    thread pool, so total concurrency is file_workers x per-file workers.
+    The claim loop excludes in-flight file names so a worker's job is
+    never re-claimed as "interrupted" while it is being processed.
+    """
+    in_flight: "dict" = {}  # future -> processing path
+    with ProcessPoolExecutor(
+            max_workers=args.file_workers, initializer=_init_file_worker
+    ) as pool:
+        while True:
+            busy = frozenset(path.name for path in in_flight.values())
+            claim_failed = False
+            while len(in_flight) < args.file_workers:
+                processing_path = _claim_next_job(args, busy)
+                if processing_path is _RETRY:
+                    # Transient move failure — a job still exists, so this
+                    # must not be mistaken for an empty queue below.
+                    claim_failed = True
+                    break
+                if processing_path is None:
+                    break
+                future = pool.submit(
+                    process_file_standalone, processing_path, args, system_prompt
+                )
+                in_flight[future] = processing_path
+                busy = busy | {processing_path.name}
+
+            if not in_flight:
+                if claim_failed:
+                    continue  # Re-scan, like the single-file loop does
+                logging.info("Processing and todo directories are empty. Shutting down.")
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                processing_path = in_flight.pop(future)
+                error = future.exception()
+                if error is not None:
+                    logging.error(f"Worker for {processing_path.name} failed: {error}")
 
 
 def run() -> None:
     """Main entry point of the application logic."""
     load_dotenv()
-    setup_logging()
     args = parse_arguments()
+    # Only single-worker runs keep the tqdm-integrated console handler;
+    # anything threaded goes through the queue-based logging path.
+    setup_logging(
+        single_worker=(args.workers == 1 and not args.auto_tune and args.file_workers == 1)
+    )
 
     # Ensure all directories exist
-    args.todo_dir.mkdir(exist_ok=True)
-    args.processing_dir.mkdir(exist_ok=True)
-    args.done_dir.mkdir(exist_ok=True)
+    _ensure_dir(args.todo_dir)
+    _ensure_dir(args.processing_dir)
+    _ensure_dir(args.done_dir)
 
     try:
-        with open(args.prompt_file, "r", encoding="utf-8") as f:
-            system_prompt = f.read()
-    except IOError as e:
+        system_prompt = load_system_prompt(args.prompt_file)
+    except (IOError, OSError) as e:
         logging.critical(f"Could not read prompt file at {args.prompt_file}: {e}")
         sys.exit(1)
 
     # --- FIX: New 'while' loop logic to continuously check for files ---
     try:
         logging.info("Starting processing loop. Checking for jobs...")
+        if args.file_workers > 1:
+            _run_multi_file(args, system_prompt)
+            return
         while True:
-            # 1. Prioritize any job already in the processing directory
-            processing_files = _get_files(args.processing_dir)
-            if processing_files:
-                logging.info(f"Found {len(processing_files)} interrupted job(s). Resuming first one.")
-                file_path = processing_files[0]
-                processor = FileProcessor(processing_path=file_path, args=args, system_prompt=system_prompt)
-                processor.run()
-                continue  # Re-start loop to check processing dir again
-
-            # 2. Process new jobs from the todo directory
-            todo_files = _get_files(args.todo_dir)
-            if todo_files:
-                logging.info(f"Found {len(todo_files)} new job(s). Starting first one.")
-                source_path = todo_files[0]
-                processing_path = args.processing_dir / source_path.name
-
-                try:
-                    shutil.move(source_path, processing_path)
-                    logging.info(f"Moved {source_path.name} to processing directory.")
-                except (IOError, OSError) as e:
-                    logging.error(f"Could not move {source_path.name} to processing: {e}")
-                    time.sleep(1) # Wait a second if move failed (e.g. file lock)
-                    continue  # Skip this file and re-loop
-
-                processor = FileProcessor(processing_path=processing_path, args=args, system_prompt=system_prompt)
-                processor.run()
-                continue  # Re-start loop to check processing/todo dirs again
-
-            # 3. If we are here, both directories were empty.
-            logging.info("Processing and todo directories are empty. Shutting down.")
-            break  # Exit the while True loop
+            processing_path = _claim_next_job(args)
+            if processing_path is None:
+                # Both directories were empty.
+                logging.info("Processing and todo directories are empty. Shutting down.")
+                break  # Exit the while True loop
+
+            if processing_path is _RETRY:
+                continue  # Claiming failed; re-scan the directories
+
+            processor = FileProcessor(processing_path=processing_path, args=args, system_prompt=system_prompt)
+            processor.run()
+            # Re-start loop to check processing/todo dirs again
 
     except KeyboardInterrupt:
         logging.warning("--- SHUTDOWN REQUESTED (Ctrl+C) ---")
@@ -2,22 +2,198 @@
 import argparse
 import json
 import logging
+import os
+import queue
 import shutil
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from heapq import heappop, heappush
+from itertools import chain, islice
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
 
 from tqdm import tqdm
 
-from ai_translator.services.ai_api import call_ai_translation_api
+from ai_translator.services.ai_api import (
+    call_ai_translation_api,
+    call_ai_translation_batch_api,
+    create_session,
+)
 from ai_translator.state_manager import finalize_and_cleanup, read_progress, write_progress
 # --- FIX: Import Tuner ---
 from ai_translator.tuner import WorkerTuner
 
 # --- End FIX ---
+from ai_translator.utils import SOURCE_LANG_PRIORITY
+
+# Module logger: per-item messages use %-style deferred formatting, so the
+# string is only built when a handler actually wants the record.
+logger = logging.getLogger(__name__)
+
+# orjson is 2-5x faster than the stdlib and returns UTF-8 bytes directly,
+# but it stays optional: fall back to the stdlib when it is not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ijson streams the source array item-by-item, so a multi-MB file never has
+# to be fully resident in memory. Optional, like orjson above.
+try:
+    import ijson
+
+    _SOURCE_READ_ERRORS: Tuple[type, ...] = (IOError, ijson.JSONError)
+except ImportError:
+    ijson = None
+    _SOURCE_READ_ERRORS = (IOError, json.JSONDecodeError)
+
+# How many leading items to materialize up front (the auto-tuner needs a
+# concrete sample to measure against before the stream is consumed).
+TUNING_SAMPLE_SIZE = 256
+
+# Checkpoint at least this often even when fewer than batch_size items
+# completed, so slow trickles still bound the redo window on resume.
+CHECKPOINT_INTERVAL_S = 2.0
+
+# Tells the writer thread to drain its buffer and exit.
+_WRITER_SHUTDOWN = object()
+
+# Marks a batch slot whose translation failed for good. Such items are
+# withheld from the writer so the progress frontier stalls at them: the
+# file then stays in 'processing' and a later run retries from the sidecar
+# index instead of finalizing an untranslated result as done.
+_TRANSLATION_FAILED = object()
+
+# Worker threads only run a blocking HTTP call plus light JSON handling, so
+# the platform default stack (often 8 MiB) is vastly oversized. 512 KiB keeps
+# hundreds of workers cheap; applied before any pool spins up its threads.
+WORKER_STACK_SIZE = 512 * 1024
+
+# Live-concurrency controller: how many recent latencies to keep, how often
+# to re-evaluate the window, and how much p95 drift / error rate we accept
+# before backing off.
+LATENCY_WINDOW = 100
+ADAPT_EVERY = 50
+LATENCY_TOLERANCE = 1.5
+ERROR_RATE_LIMIT = 0.01
+
+
+class _WindowController:
+    """Adapts the in-flight submission window to live API behavior.
+
+    The one-shot tuner picks a good starting worker count, but server-side
+    conditions drift over a long run (rate limits, model load, contention).
+    Every ADAPT_EVERY completions the controller compares the recent p95
+    latency against the best it has seen: while latency holds and errors
+    stay rare, the window grows by one; when either degrades, the window
+    shrinks by 25%. Only the result-collection loop calls into it, so no
+    locking is needed.
+
+    The window is the binding concurrency limit: the pool is sized at
+    max_window, so every in-flight future has a thread and the number of
+    concurrent API calls really is the window — growing it adds live
+    calls, shrinking it (down to half the tuned count) sheds them.
+    """
+
+    def __init__(self, num_workers: int):
+        self.min_window = max(1, num_workers // 2)
+        self.max_window = num_workers * 8
+        self.window = num_workers
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._completions = 0
+        self._last_failures = 0
+        self._best_p95: Optional[float] = None
+
+    def record(self, latency: float, failures_total: int) -> None:
+        """Feed one completion; occasionally re-sizes the window."""
+        self._latencies.append(latency)
+        self._completions += 1
+        if self._completions % ADAPT_EVERY:
+            return
+
+        ordered = sorted(self._latencies)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        failed = failures_total - self._last_failures
+        self._last_failures = failures_total
+
+        if self._best_p95 is None or p95 < self._best_p95:
+            self._best_p95 = p95
+
+        healthy = (
+                failed <= ADAPT_EVERY * ERROR_RATE_LIMIT
+                and p95 <= self._best_p95 * LATENCY_TOLERANCE
+        )
+        if healthy:
+            self.window = min(self.window + 1, self.max_window)
+        else:
+            self.window = max(int(self.window * 0.75), self.min_window)
+            # Re-baseline after backing off so one spike does not pin the
+            # window at the floor forever.
+            self._best_p95 = None
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Window controller: p95=%.2fs, failures=%d, in-flight window -> %d.",
+                p95, failed, self.window,
+            )
+
+
+def _dump_jsonl_line(item: Dict[str, Any]) -> bytes:
+    """Serialize one item to a UTF-8 encoded .jsonl line (with newline)."""
+    if orjson is not None:
+        # OPT_APPEND_NEWLINE emits the newline without a bytes concat
+        return orjson.dumps(item, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(item, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+# Rank of each preferred source language; lower wins.
+_PRIORITY_RANK = {lang: rank for rank, lang in enumerate(SOURCE_LANG_PRIORITY)}
+
+
+def _scan_item(
+        item: Dict[str, Any]
+) -> Tuple[List[str], List[str], Optional[Tuple[str, str]]]:
+    """Single pass over an item: (available, missing, source) in one walk.
+
+    `source` is the best (lang, text) pair by SOURCE_LANG_PRIORITY rank,
+    falling back to the first non-empty language value, or None. Folding
+    the source pick into the key scan saves a second dict walk per item.
+    """
+    available: List[str] = []
+    missing: List[str] = []
+    first: Optional[Tuple[str, str]] = None
+    best: Optional[Tuple[str, str]] = None
+    best_rank = len(_PRIORITY_RANK)
+    for key, value in item.items():
+        # Inlined is_language_key: this runs for every key of every item,
+        # and the function-call overhead is the expensive part of the check.
+        if len(key) == 2:
+            if value:
+                available.append(key)
+                if first is None:
+                    first = (key, value)
+                rank = _PRIORITY_RANK.get(key)
+                if rank is not None and rank < best_rank:
+                    best_rank = rank
+                    best = (key, value)
+            else:
+                missing.append(key)
+    return available, missing, best if best is not None else first
+
+
+def process_file_standalone(
+        processing_path: Path,
+        args: argparse.Namespace,
+        system_prompt: str
+) -> None:
+    """Runs one FileProcessor to completion.
 
-# Language priority for finding a source text
-SOURCE_LANG_PRIORITY = ["de", "en", "fr"]
+    Top-level (picklable) entry point for file-level worker processes:
+    each input file is independent work, so --file-workers > 1 runs one
+    of these per process on top of the intra-file thread pool.
+    """
+    FileProcessor(processing_path=processing_path, args=args, system_prompt=system_prompt).run()
 
 
 class FileProcessor:
@@ -29,55 +205,56 @@ class FileProcessor:
         self.system_prompt = system_prompt
         self.jsonl_path = self.processing_path.with_suffix(".jsonl")
         self.progress_path = self.processing_path.with_suffix(".progress")
-
-    @staticmethod
-    def _is_language_key(key: str) -> bool:
-        """Check if a key is a 2-letter language code."""
-        return len(key) == 2
-
-    def _get_source_language(self, item: Dict[str, Any]) -> Optional[Tuple[str, str]]:
-        """Finds the best available source language based on priority."""
-        for lang in SOURCE_LANG_PRIORITY:
-            if item.get(lang) and self._is_language_key(lang):
-                return lang, item[lang]
-        for lang, text in item.items():
-            if self._is_language_key(lang) and text:
-                return lang, text
-        return None
-
-    def _translate_item(self, item: Dict[str, Any], item_index: int, batch_start_index: int) -> Dict[str, Any]:
+        # One pooled session shared by all worker threads: connections are
+        # kept alive between items instead of re-handshaking per call.
+        self.session = create_session()
+        self._last_checkpoint = time.monotonic()
+        # Frontier index covered by the last durable checkpoint.
+        self._checkpoint_index = 0
+        # Source mtime recorded into the progress sidecar (set in run()).
+        self._source_mtime_ns: Optional[int] = None
+        # Approximate count of failed API translations. Bumped from worker
+        # threads without a lock: it only feeds the window controller's
+        # error-rate heuristic, where an off-by-one is harmless.
+        self._api_failures = 0
+
+    def _translate_item(
+            self, item: Dict[str, Any], item_index: int, batch_start_index: int,
+            missing: List[str], source_info: Optional[Tuple[str, str]]
+    ) -> Dict[str, Any]:
         """Handles the translation logic for a single item."""
-        lang_values = {k: v for k, v in item.items() if self._is_language_key(k)}
-        missing = [k for k, v in lang_values.items() if not v]
-
         if not missing:
-            # --- FIX: Use logging, not tqdm.write ---
-            logging.info(f"Item #{item_index} is already fully translated.")
+            # Routine per-item logs stay off the hot path: debug-level, and
+            # guarded so the f-string is never built in production runs.
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Item #%d is already fully translated.", item_index)
             return item
 
-        source_info = self._get_source_language(item)
         if not source_info:
             # --- FIX: Use logging, not tqdm.write ---
-            logging.error(f"[ERROR] Item #{item_index}: No valid source text found.")
+            logger.error("[ERROR] Item #%d: No valid source text found.", item_index)
             return item
 
         source_lang, source_text = source_info
 
-        if (item_index - batch_start_index) % self.args.batch_size == 0:
-            user_prompt_example = f"{source_text} /no_think"
-            logging.debug(f"Batch start prompt for item #{item_index}: {user_prompt_example}")
+        if (
+                (item_index - batch_start_index) % self.args.batch_size == 0
+                and logger.isEnabledFor(logging.DEBUG)
+        ):
+            logger.debug("Batch start prompt for item #%d: %s /no_think", item_index, source_text)
 
-        translations = call_ai_translation_api(source_text, self.system_prompt, self.args.model)
+        translations = call_ai_translation_api(source_text, self.system_prompt, self.args.model, self.session)
 
         if translations:
             for lang_code, text in translations.items():
                 if lang_code in missing:
                     item[lang_code] = text
-            # --- FIX: Use logging, not tqdm.write ---
-            logging.info(f"Item #{item_index} successfully translated.")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Item #%d successfully translated.", item_index)
         else:
             # --- FIX: Use logging, not tqdm.write ---
-            logging.error(f"[ERROR] Translation failed for item #{item_index}.")
+            self._api_failures += 1
+            logger.error("[ERROR] Translation failed for item #%d.", item_index)
 
         return item
 
@@ -90,31 +267,28 @@ class FileProcessor:
         item_index, item = item_tuple
 
         try:
-            available_langs = [k for k, v in item.items() if self._is_language_key(k) and v]
-            if len(available_langs) < 1:
-                # --- FIX: Use logging, not tqdm.write ---
-                logging.info(f"Item #{item_index} (tune) has 0 languages. Skipping.")
+            available, missing, source_info = _scan_item(item)
+            if not available:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Item #%d (tune) has 0 languages. Skipping.", item_index)
                 return item_index, None, "skipped"
 
-            lang_values = {k: v for k, v in item.items() if self._is_language_key(k)}
-            missing = [k for k, v in lang_values.items() if not v]
             if not missing:
                 return item_index, item, "skipped"  # Already translated
 
-            source_info = self._get_source_language(item)
             if not source_info:
                 return item_index, item, "skipped"  # No source
 
             # Call the core translation logic
             # Note: The tuner only cares about execution time, not batch_start_index
-            processed_item = self._translate_item(item, item_index, 0)
+            processed_item = self._translate_item(item, item_index, 0, missing, source_info)
 
             # This is good enough for a time-based test.
             return item_index, processed_item, "translated"
 
         except Exception as e:
             # --- FIX: Use logging, not tqdm.write ---
-            logging.error(f"[CRITICAL_THREAD_ERROR] (Tune) Item #{item_index} failed: {e}")
+            logger.error("[CRITICAL_THREAD_ERROR] (Tune) Item #%d failed: %s", item_index, e)
             return item_index, item, "failed"
 
     # --- End FIX ---
@@ -131,50 +305,272 @@ class FileProcessor:
         """
         try:
             # This logic is from your working snapshot's run() loop
-            available_langs = [k for k, v in item.items() if self._is_language_key(k) and v]
-            if len(available_langs) < 1:
-                # --- FIX: Use logging, not tqdm.write ---
-                logging.info(f"Item #{item_index} has 0 languages. Skipping.")
+            available, missing, source_info = _scan_item(item)
+            if not available:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Item #%d has 0 languages. Skipping.", item_index)
                 return item_index, None  # None indicates "skip"
 
             # This logic calls your working snapshot's translate function
-            processed_item = self._translate_item(item, item_index, batch_start_index)
+            processed_item = self._translate_item(item, item_index, batch_start_index, missing, source_info)
             return item_index, processed_item
 
         except Exception as e:
             # Catch errors within the thread to avoid killing the whole pool
             # --- FIX: Use logging, not tqdm.write ---
-            logging.error(f"[CRITICAL_THREAD_ERROR] Item #{item_index} failed: {e}", exc_info=True)
+            logger.error("[CRITICAL_THREAD_ERROR] Item #%d failed: %s", item_index, e, exc_info=True)
             # Return original item on failure, so progress can advance
             return item_index, item
 
+    def _translate_batch(
+            self, batch: List[Tuple[int, Dict[str, Any]]]
+    ) -> List[Tuple[int, Optional[Dict[str, Any]]]]:
+        """Translates a group of items with a single batched API call.
+
+        Skips and already-translated items are resolved locally; only items
+        with real missing languages go into the API payload.
+        """
+        results: List[Tuple[int, Optional[Dict[str, Any]]]] = []
+        payload: List[str] = []
+        payload_slots: List[int] = []  # Positions in `results` fed by the API
+
+        for item_index, item in batch:
+            available, missing, source_info = _scan_item(item)
+            if not available:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Item #%d has 0 languages. Skipping.", item_index)
+                results.append((item_index, None))  # None indicates "skip"
+                continue
+            if not missing:
+                results.append((item_index, item))
+                continue
+            if not source_info:
+                logger.error("[ERROR] Item #%d: No valid source text found.", item_index)
+                results.append((item_index, item))
+                continue
+            payload_slots.append(len(results))
+            payload.append(source_info[1])
+            results.append((item_index, item))
+
+        if payload:
+            self._apply_batch_translations(payload, payload_slots, results)
+            # Failed slots never reach the writer: their indices are left
+            # out of the completion stream, the frontier stalls at the
+            # first one, and the run ends un-finalized so a resume can
+            # retry them (see _TRANSLATION_FAILED).
+            return [
+                (item_index, item)
+                for item_index, item in results
+                if item is not _TRANSLATION_FAILED
+            ]
+
+        return results
+
+    def _apply_batch_translations(
+            self,
+            payload: List[str],
+            payload_slots: List[int],
+            results: List[Tuple[int, Optional[Dict[str, Any]]]]
+    ) -> None:
+        """Runs one batched API call and merges translations into `results`.
+
+        A malformed batch response is retried by bisection: one bad item
+        only sinks its half of the log2(K) sub-batches, not the whole
+        request. A single-item payload that still fails is a real failure.
+        """
+        translations_list = call_ai_translation_batch_api(
+            payload, self.system_prompt, self.args.model, self.session
+        )
+        if translations_list:
+            for slot, translations in zip(payload_slots, translations_list):
+                item_index, item = results[slot]
+                if not translations:
+                    self._api_failures += 1
+                    logger.error(
+                        "[ERROR] Translation failed for item #%d. Leaving it for a resumed run.",
+                        item_index,
+                    )
+                    results[slot] = (item_index, _TRANSLATION_FAILED)
+                    continue
+                _, missing, _source = _scan_item(item)
+                for lang_code, text in translations.items():
+                    if lang_code in missing:
+                        item[lang_code] = text
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Item #%d successfully translated.", item_index)
+            return
+
+        if len(payload) == 1:
+            # Base case: retry the lone item over the single-call path,
+            # which matches the prompt's flat-object contract and gets the
+            # cache and single-flight coalescing for free.
+            slot = payload_slots[0]
+            item_index, item = results[slot]
+            translations = call_ai_translation_api(
+                payload[0], self.system_prompt, self.args.model, self.session
+            )
+            if translations:
+                _, missing, _source = _scan_item(item)
+                for lang_code, text in translations.items():
+                    if lang_code in missing:
+                        item[lang_code] = text
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Item #%d successfully translated.", item_index)
+                return
+            self._api_failures += 1
+            logger.error(
+                "[ERROR] Translation failed for item #%d. Leaving it for a resumed run.",
+                item_index,
+            )
+            results[slot] = (item_index, _TRANSLATION_FAILED)
+            return
+
+        mid = len(payload) // 2
+        logger.warning(
+            "Batch of %d items failed to parse; bisecting and retrying.", len(payload)
+        )
+        self._apply_batch_translations(payload[:mid], payload_slots[:mid], results)
+        self._apply_batch_translations(payload[mid:], payload_slots[mid:], results)
+
+    def _process_batch_wrapper(
+            self,
+            batch: List[Tuple[int, Dict[str, Any]]],
+            batch_start_index: int
+    ) -> List[Tuple[int, Optional[Dict[str, Any]]]]:
+        """Thread-pool entry point for a group of items.
+
+        A single-item batch keeps the one-call-per-item path; larger batches
+        share one API request. Returns (index, item-or-None) pairs.
+        """
+        if len(batch) == 1:
+            item_index, item = batch[0]
+            return [self._process_item_wrapper(item_index, item, batch_start_index)]
+
+        try:
+            return self._translate_batch(batch)
+        except Exception as e:
+            # Catch errors within the thread to avoid killing the whole pool
+            logger.error(
+                "[CRITICAL_THREAD_ERROR] Batch starting at item #%d failed: %s",
+                batch[0][0], e,
+                exc_info=True
+            )
+            # Return original items on failure, so progress can advance
+            return [(item_index, item) for item_index, item in batch]
+
+    def _maybe_checkpoint(self, jsonl_file: Any, next_index: int) -> None:
+        """Flushes data and records progress when the frontier moved enough.
+
+        Fires every batch_size newly contiguous items, or when the last
+        checkpoint is older than the interval. Progress is written *after*
+        the flush+fsync, so the recorded index never points past durable
+        data. A frontier that has not moved is never re-checkpointed.
+        """
+        if next_index == self._checkpoint_index:
+            return
+        if (
+                next_index - self._checkpoint_index < self.args.batch_size
+                and time.monotonic() - self._last_checkpoint < CHECKPOINT_INTERVAL_S
+        ):
+            return
+        jsonl_file.flush()
+        # fsync before recording progress: the index must never point past
+        # durable data.
+        os.fsync(jsonl_file.fileno())
+        write_progress(self.progress_path, next_index, source_mtime_ns=self._source_mtime_ns)
+        self._last_checkpoint = time.monotonic()
+        self._checkpoint_index = next_index
+
+    def _iter_source_items(self) -> Iterator[Dict[str, Any]]:
+        """Yields items from the source JSON array one at a time.
+
+        Uses ijson for true streaming when available; otherwise falls back
+        to loading the whole file with the stdlib parser.
+        """
+        with open(self.processing_path, "rb") as f:
+            if ijson is not None:
+                yield from ijson.items(f, "item")
+            elif orjson is not None:
+                yield from orjson.loads(f.read())
+            else:
+                yield from json.load(f)
+
     def run(self) -> None:
         """Orchestrates the processing of the file already in the processing directory."""
         logging.info(f"--- Starting processing for {self.processing_path.name} ---")
 
         try:
-            with open(self.processing_path, "r", encoding="utf-8") as f:
-                source_data = json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            logging.error(f"Could not read source file {self.processing_path.name}: {e}")
+            self._source_mtime_ns = self.processing_path.stat().st_mtime_ns
+        except OSError:
+            self._source_mtime_ns = None
+
+        resume_index, known_total = read_progress(self.progress_path, self._source_mtime_ns)
+        if known_total is not None and resume_index >= known_total:
+            # A previous run processed everything but died before (or
+            # during) finalize: no need to touch the source file again.
+            logging.info(f"All {known_total} items already processed. Finalizing.")
+            finalize_and_cleanup(self.processing_path, self.args.done_dir)
             return
-
-        resume_index = read_progress(self.progress_path)
         if resume_index > 0:
             logging.info(f"Resuming at item #{resume_index} from {self.progress_path.name}.")
 
-        if resume_index >= len(source_data):
-            logging.info("All source items evaluated. Finalizing.")
-            finalize_and_cleanup(self.processing_path, self.args.done_dir)
+        # Completed (index, item) results travel through this queue to a
+        # dedicated writer thread, which persists them. The
+        # queue is unbounded because skips can be enqueued before the
+        # writer starts; worker results are bounded by the in-flight window.
+        write_queue: "queue.Queue" = queue.Queue()
+
+        # One past the highest source index seen so far. Streaming means we
+        # never know the file length up front; completion is "stream
+        # exhausted and everything seen was written".
+        items_seen_end = resume_index
+
+        def _schedulable_items() -> Iterator[Tuple[int, Dict[str, Any]]]:
+            """Streams (index, item) pairs from resume_index onwards.
+
+            Items without any language value never need a worker thread:
+            they are marked skipped here instead of paying a thread hop.
+            """
+            nonlocal items_seen_end
+            for i, item in islice(enumerate(self._iter_source_items()), resume_index, None):
+                items_seen_end = i + 1
+                try:
+                    available, missing, _source = _scan_item(item)
+                except (AttributeError, TypeError):
+                    # Non-object entries in the source array (a stray
+                    # string, number or null) cannot be scanned; pass them
+                    # through unchanged like the pre-streaming code did
+                    # instead of killing the run. The "__raw" wrapper keeps
+                    # the writer's dict-only line format; finalize unwraps.
+                    logger.warning("Item #%d is not a JSON object. Passing it through unchanged.", i)
+                    write_queue.put((i, {"__raw": item}))
+                    continue
+                if not available:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Item #%d has 0 languages. Skipping.", i)
+                    write_queue.put((i, None))  # None indicates "skip"
+                    continue
+                if not missing:
+                    # Already fully translated: write it through as-is so
+                    # workers only ever see items needing real API calls.
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Item #%d is already fully translated.", i)
+                    write_queue.put((i, item))
+                    continue
+                yield i, item  # Tuple: (original_index, item_data)
+
+        schedulable = _schedulable_items()
+
+        # Materialize a head sample: the tuner needs a concrete list, and an
+        # empty head tells us the file is already fully evaluated.
+        try:
+            head_items = list(islice(schedulable, TUNING_SAMPLE_SIZE))
+        except _SOURCE_READ_ERRORS as e:
+            logging.error(f"Could not read source file {self.processing_path.name}: {e}")
             return
 
-        # 1. Prepare items to process (from the resume_index onwards)
-        items_to_process = []
-        for i in range(resume_index, len(source_data)):
-            items_to_process.append((i, source_data[i]))  # Tuple: (original_index, item_data)
-
-        if not items_to_process:
-            logging.info("No items left to process.")
+        if not head_items and write_queue.empty():
+            logging.info("All source items evaluated. Finalizing.")
             finalize_and_cleanup(self.processing_path, self.args.done_dir)
             return
 
@@ -182,18 +578,32 @@ class FileProcessor:
         num_workers = self.args.workers  # Get fallback workers
 
         # Check if auto-tune is enabled (it is by default, see config)
-        if self.args.auto_tune and len(items_to_process) > 40:  # Need enough items to tune
+        if self.args.auto_tune and len(head_items) > 40:  # Need enough items to tune
             logging.info("Starting auto-tuner...")
+
+            def _refill_tuning_items() -> List[Tuple[int, Dict[str, Any]]]:
+                """Feeds the tuner fresh untranslated items from the stream.
+
+                Tuner rounds translate their items in place, so a fixed
+                head sample runs dry mid-tuning and later candidates would
+                measure zero work. Everything pulled here is appended to
+                head_items so the main pass still writes it out (already-
+                translated items pass straight through the wrappers).
+                """
+                fresh = list(islice(schedulable, TUNING_SAMPLE_SIZE))
+                head_items.extend(fresh)
+                return fresh
+
             try:
-                tuner = WorkerTuner(self)  # Requires _process_single_item
-                num_workers = tuner.auto_tune(items_to_process)
+                tuner = WorkerTuner(self, refill=_refill_tuning_items)  # Requires _process_single_item
+                num_workers = tuner.auto_tune(head_items)
             except ImportError:
                 logging.warning("Auto-tune failed: Could not import WorkerTuner. Falling back to default workers.")
             except Exception as e:
                 logging.error(f"Auto-tune failed: {e}. Falling back to default workers.")
         else:
             if self.args.auto_tune:
-                logging.info(f"Skipping auto-tune (only {len(items_to_process)} items). Using {num_workers} worker(s).")
+                logging.info(f"Skipping auto-tune (only {len(head_items)} items). Using {num_workers} worker(s).")
             else:
                 logging.info(f"Auto-tune disabled. Using {num_workers} worker(s).")
         # --- End FIX ---
@@ -205,74 +615,169 @@ class FileProcessor:
         # This is the next sequential index we must write to the file.
         next_index_to_write = resume_index
 
-        # Buffer for results that finish out of order
-        results_buffer: Dict[int, Optional[Dict[str, Any]]] = {}
-
         processing_completed = False
 
         try:
-            write_mode = "a" if resume_index > 0 else "w"
-            with open(self.jsonl_path, write_mode, encoding="utf-8") as jsonl_file:
-                with ThreadPoolExecutor(max_workers=num_workers) as executor:
-
-                    futures = {
-                        # Use the *main* wrapper, not the tuner's shim
-                        executor.submit(self._process_item_wrapper, i, item, resume_index): i
-                        for (i, item) in items_to_process
-                    }
-
-                    # --- FIX: Correct tqdm bar formatting ---
-                    # Format: Description |Bar| Count [Speed]
-                    custom_bar_format = (
-                        "{l_bar} |{bar}| {n_fmt}/{total_fmt} [{rate_fmt}]"
-                    )
-
-                    progress_bar = tqdm(
-                        initial=0,
-                        total=len(items_to_process),
-                        desc=f"Processing {self.processing_path.name}",
-                        unit=" items",
-                        ncols=150,  # Fixed width of 100 characters
-                        bar_format=custom_bar_format,
-                        ascii="░█"  # Use light shade (░) for empty, full block (█) for full
-                    )
-                    # --- END FIX ---
-
-                    with progress_bar:
-                        for future in as_completed(futures):
-                            # 1. A thread finished (out of order)
-                            original_index, processed_item = future.result()
-
-                            results_buffer[original_index] = processed_item
-                            progress_bar.update(1)
+            threading.stack_size(WORKER_STACK_SIZE)
+        except (ValueError, RuntimeError):
+            pass  # Platform minimum not met; keep the default
 
-                            # 2. Try to flush the buffer *in order*
-                            while next_index_to_write in results_buffer:
-                                # Get the item for the *correct* index
-                                buffered_item = results_buffer.pop(next_index_to_write)
-
-                                # A) Write item to .jsonl (if it wasn't skipped)
-                                if buffered_item:
-                                    jsonl_file.write(json.dumps(buffered_item, ensure_ascii=False) + "\n")
-
-                                # --- FIX: Force flush to disk immediately ---
-                                jsonl_file.flush()
-
-                                # B) Update progress file to point to the *next* item
-                                write_progress(self.progress_path, next_index_to_write + 1)
-
-                                # C) Increment the pointer
-                                next_index_to_write += 1
-
-                        # Final flush in case the loop finishes but buffer logic didn't
-                        jsonl_file.flush()
-
-                        # 3. Check if we finished the whole file
-                        if next_index_to_write == len(source_data):
-                            processing_completed = True
-                        else:
-                            logging.info(
-                                f"Processing loop finished. Progress saved up to item {next_index_to_write - 1}.")
+        try:
+            write_mode = "ab" if resume_index > 0 else "wb"
+            # Binary mode (lines are pre-encoded UTF-8 bytes) with a large
+            # buffer so item writes coalesce in memory instead of hitting the
+            # disk with one syscall per item.
+            with open(self.jsonl_path, write_mode, buffering=1 << 20) as jsonl_file:
+                # Writer thread: owns every .jsonl/progress write. Results
+                # are appended the moment they arrive, tagged with their
+                # source index ("__idx"), so one slow item never stalls the
+                # items behind it; finalize sorts the lines back into order.
+                # Only the *progress frontier* stays contiguous: the heap
+                # holds completed indices ahead of it, and the recorded
+                # index advances as gaps close.
+                self._checkpoint_index = resume_index
+                writer_state: Dict[str, Any] = {"next_index": resume_index}
+
+                def _writer_loop() -> None:
+                    ahead: List[int] = []  # Completed indices past the frontier
+                    next_index = resume_index
+                    # Hoist hot attribute lookups to locals: this loop runs
+                    # once per item, and LOAD_FAST beats repeated attribute
+                    # resolution when the API is fast enough for Python
+                    # coordination to matter.
+                    queue_get = write_queue.get
+                    file_write = jsonl_file.write
+                    dump_line = _dump_jsonl_line
+                    push, pop = heappush, heappop
+                    maybe_checkpoint = self._maybe_checkpoint
+                    try:
+                        while True:
+                            entry = queue_get()
+                            if entry is _WRITER_SHUTDOWN:
+                                break
+                            index, item = entry
+                            if item is not None:  # None indicates "skip"
+                                file_write(dump_line({"__idx": index, **item}))
+                            push(ahead, index)
+                            while ahead and ahead[0] == next_index:
+                                pop(ahead)
+                                next_index += 1
+                            maybe_checkpoint(jsonl_file, next_index)
+                    except Exception as e:
+                        logging.critical(f"Writer thread failed: {e}")
+                        writer_state["error"] = True
+                    finally:
+                        writer_state["next_index"] = next_index
+
+                writer_thread = threading.Thread(target=_writer_loop, name="jsonl-writer")
+                writer_thread.start()
+
+                try:
+                    # Sliding-window submission: keep a bounded number of
+                    # futures in flight instead of materializing one Future
+                    # per item up front. This bounds both executor queue
+                    # memory and the writer's completion backlog. The window
+                    # size itself tracks live latency/error feedback; the
+                    # pool is sized at its ceiling so the window — not the
+                    # thread count — is what limits concurrent API calls
+                    # (threads above the tuned count spawn lazily, only if
+                    # the window ever grows there).
+                    controller = _WindowController(num_workers)
+                    with ThreadPoolExecutor(max_workers=controller.max_window) as executor:
+                        api_batch_size = max(1, self.args.api_batch_size)
+                        item_iterator = chain(head_items, schedulable)
+                        in_flight: Dict[Any, float] = {}
+
+                        def _submit_next() -> bool:
+                            """Submit the next pending batch, if any. Returns False when exhausted."""
+                            batch = list(islice(item_iterator, api_batch_size))
+                            if not batch:
+                                return False
+                            # Use the *main* wrapper, not the tuner's shim
+                            future = executor.submit(self._process_batch_wrapper, batch, resume_index)
+                            in_flight[future] = time.monotonic()
+                            return True
+
+                        for _ in range(controller.window):
+                            if not _submit_next():
+                                break
+
+                        # --- FIX: Correct tqdm bar formatting ---
+                        # Format: Description |Bar| Count [Speed]
+                        custom_bar_format = (
+                            "{l_bar} |{bar}| {n_fmt}/{total_fmt} [{rate_fmt}]"
+                        )
+
+                        progress_bar = tqdm(
+                            initial=0,
+                            total=None,  # Unknown while streaming the source
+                            desc=f"Processing {self.processing_path.name}",
+                            unit=" items",
+                            ncols=150,  # Fixed width of 100 characters
+                            bar_format=custom_bar_format,
+                            ascii="░█"  # Use light shade (░) for empty, full block (█) for full
+                        )
+                        # --- END FIX ---
+
+                        with progress_bar:
+                            # Same local-binding trick as the writer loop: these
+                            # run once per completed batch.
+                            flight_pop = in_flight.pop
+                            record = controller.record
+                            monotonic = time.monotonic
+                            queue_put = write_queue.put
+                            bar_update = progress_bar.update
+                            while in_flight:
+                                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+
+                                for future in done:
+                                    submitted_at = flight_pop(future)
+                                    record(monotonic() - submitted_at, self._api_failures)
+
+                                    # 1. A thread finished (out of order)
+                                    batch_results = future.result()
+
+                                    # 2. Hand results to the writer thread
+                                    for result in batch_results:
+                                        queue_put(result)
+                                    bar_update(len(batch_results))
+
+                                # Backfill up to the (possibly re-sized) window
+                                while len(in_flight) < controller.window:
+                                    if not _submit_next():
+                                        break
+
+                finally:
+                    # Always release the writer, even on errors
+                    write_queue.put(_WRITER_SHUTDOWN)
+                    writer_thread.join()
+
+                # Take stock of what the writer persisted
+                next_index_to_write = writer_state["next_index"]
+
+                if writer_state.get("error"):
+                    logging.info(f"Progress saved up to item {next_index_to_write - 1}. Job will resume.")
+                    return  # Do not finalize
+
+                # Final checkpoint so progress matches everything written
+                jsonl_file.flush()
+                os.fsync(jsonl_file.fileno())
+                # The stream is exhausted here, so the total is now known
+                # and gets persisted for crash-free-finalize on resume.
+                write_progress(
+                    self.progress_path,
+                    next_index_to_write,
+                    total=items_seen_end,
+                    source_mtime_ns=self._source_mtime_ns,
+                )
+
+                # 3. Check if we finished the whole file (the stream is
+                # exhausted once the submission loop drains)
+                if next_index_to_write == items_seen_end:
+                    processing_completed = True
+                else:
+                    logging.info(
+                        f"Processing loop finished. Progress saved up to item {next_index_to_write - 1}.")
 
         except (IOError, Exception) as e:
             # We still catch *other* errors to log progress
@@ -282,7 +787,7 @@ class FileProcessor:
 
         # 4. Finalize
         if processing_completed:
-            logging.info(f"All {len(source_data)} items processed.")
+            logging.info(f"All {items_seen_end} items processed.")
             finalize_and_cleanup(self.processing_path, self.args.done_dir)
         else:
             logging.info(
@@ -1,12 +1,190 @@
 # File: ai_translator/services/ai_api.py
+import hashlib
 import json
 import logging
 import os
 import re
+import threading
 import time
-from typing import Dict, Optional
+from pathlib import Path
+from typing import Dict, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter, Retry
+
+# diskcache persists translation results across runs; optional dependency.
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+# Optional fast JSON parser for response extraction (same convention as
+# elsewhere; its JSONDecodeError subclasses the stdlib one).
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# Compiled once: re.search would re-look-up the pattern cache per response.
+_JSON_FENCE_RE = re.compile(r"```json\s*(\{.*?\})\s*```", re.DOTALL)
+
+
+def _dumps_bytes(value) -> bytes:
+    """Serializes a value to UTF-8 JSON bytes with whichever codec is loaded."""
+    if _loads is json.loads:
+        return json.dumps(value, ensure_ascii=False).encode("utf-8")
+    return orjson.dumps(value)
+
+
+class PayloadBuilder:
+    """Pre-serialized request body for a fixed (system prompt, model) pair.
+
+    The system prompt is by far the largest part of every request body and
+    is constant across a whole file. Serializing it once and splicing only
+    the per-item user content into the template skips re-encoding the
+    prompt on every call.
+    """
+
+    # Control characters never survive JSON encoding un-escaped, so this
+    # can not collide with real content.
+    _PLACEHOLDER = "\x00USER_CONTENT\x00"
+
+    def __init__(self, system_prompt: str, model_name: str):
+        self._needle = _dumps_bytes(self._PLACEHOLDER)
+        self._template = _dumps_bytes({
+            "model": model_name,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": self._PLACEHOLDER},
+            ],
+            "temperature": 0.2, "max_tokens": 8192, "stream": False,
+        })
+
+    def build(self, user_content: str) -> bytes:
+        """Returns the full request body for one user message."""
+        return self._template.replace(self._needle, _dumps_bytes(user_content))
+
+
+# One builder per (system prompt, model); both are stable per file, so this
+# stays tiny. Guarded for the multi-threaded call path.
+_payload_builders: Dict[tuple, PayloadBuilder] = {}
+_payload_builders_lock = threading.Lock()
+
+
+def _get_payload_builder(system_prompt: str, model_name: str) -> PayloadBuilder:
+    key = (system_prompt, model_name)
+    with _payload_builders_lock:
+        builder = _payload_builders.get(key)
+        if builder is None:
+            builder = _payload_builders[key] = PayloadBuilder(system_prompt, model_name)
+    return builder
+
+# Bound for the in-memory memo of successful translations
+TRANSLATION_CACHE_MAX_ENTRIES = 100_000
+
+_translation_cache: Dict[str, Dict[str, str]] = {}
+_translation_cache_lock = threading.Lock()
+_disk_cache = None
+
+# Single-flight registry: key -> Event set when the leading request for
+# that key finishes. Concurrent duplicates wait instead of re-calling.
+_single_flight: Dict[str, threading.Event] = {}
+_single_flight_lock = threading.Lock()
+
+# Longer than the HTTP timeout, so followers always outlive their leader
+SINGLE_FLIGHT_WAIT_S = 300
+
+
+def _get_disk_cache():
+    """Lazily opens the on-disk cache (when diskcache is installed)."""
+    global _disk_cache
+    if diskcache is None:
+        return None
+    if _disk_cache is None:
+        cache_dir = Path.home() / ".cache" / "ai-batch-translate"
+        try:
+            _disk_cache = diskcache.Cache(str(cache_dir))
+        except OSError as e:
+            logging.warning(f"Could not open translation disk cache: {e}")
+            _disk_cache = False  # Do not retry every call
+    return _disk_cache or None
+
+
+def _cache_key(source_text: str, system_prompt: str, model_name: str) -> str:
+    """Digest of everything that determines a translation result."""
+    hasher = hashlib.sha1()
+    for part in (source_text, system_prompt, model_name):
+        hasher.update(part.encode("utf-8"))
+        hasher.update(b"\x00")
+    return hasher.hexdigest()
+
+
+def _normalize_source_text(source_text: str) -> str:
+    """Collapses insignificant whitespace so near-identical strings share
+    one cache entry ("Hello " and "Hello" translate the same)."""
+    return " ".join(source_text.split())
+
+
+def _cache_lookup(key: str) -> Optional[Dict[str, str]]:
+    """Checks the in-memory memo first, then the disk cache."""
+    with _translation_cache_lock:
+        cached = _translation_cache.get(key)
+    if cached is not None:
+        return cached
+    disk = _get_disk_cache()
+    if disk is not None:
+        cached = disk.get(key)
+        if cached is not None:
+            with _translation_cache_lock:
+                _translation_cache[key] = cached
+            return cached
+    return None
+
+
+def _cache_store(key: str, translations: Dict[str, str]) -> None:
+    """Records a successful translation in both cache layers."""
+    with _translation_cache_lock:
+        if len(_translation_cache) < TRANSLATION_CACHE_MAX_ENTRIES:
+            _translation_cache[key] = translations
+    disk = _get_disk_cache()
+    if disk is not None:
+        try:
+            disk.set(key, translations)
+        except OSError as e:
+            logging.warning(f"Could not write to translation disk cache: {e}")
+
+# Upper bound of keep-alive connections retained per host. Sized for the
+# largest worker counts the tuner probes; idle sockets above the bound are
+# simply closed instead of pooled.
+POOL_MAXSIZE = 256
+
+# Transient server responses worth an automatic retry with backoff. POST is
+# opted in explicitly (urllib3 excludes it by default): translation calls
+# are idempotent, a replays-safe property the cache layer relies on anyway.
+RETRY_POLICY = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=frozenset({"POST"}),
+)
+
+
+def create_session(pool_maxsize: int = POOL_MAXSIZE) -> requests.Session:
+    """Builds a Session with a connection pool sized for many workers.
+
+    Reusing one session across all items keeps TCP (and TLS) connections
+    alive between requests instead of paying the handshake per call, and
+    transient failures are retried inside urllib3 with exponential backoff.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4, pool_maxsize=pool_maxsize, max_retries=RETRY_POLICY
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
 
 
 class JsonExtractor:
@@ -16,22 +194,67 @@ class JsonExtractor:
     def extract(raw_content: str) -> str:
         trimmed = raw_content.strip()
         try:
-            json.loads(trimmed)
+            _loads(trimmed)
             return trimmed
         except json.JSONDecodeError:
             pass
-        match = re.search(r"```json\s*(\{.*?\})\s*```", trimmed, re.DOTALL)
-        if match:
-            return match.group(1)
+        # Brace slicing before the fence regex: chatty-but-well-formed
+        # responses are the common failure, a fenced block is the rare one,
+        # and the regex scan is the most expensive path of the three. The
+        # regex only runs at all when a fence marker is actually present.
         start_brace = trimmed.find('{')
         end_brace = trimmed.rfind('}')
-        if start_brace != -1 and end_brace != -1:
-            return trimmed[start_brace:end_brace + 1]
+        candidate = trimmed[start_brace:end_brace + 1] if -1 < start_brace <= end_brace else None
+        if candidate is not None:
+            try:
+                _loads(candidate)
+                return candidate
+            except json.JSONDecodeError:
+                pass
+        if "```" in trimmed:
+            match = _JSON_FENCE_RE.search(trimmed)
+            if match:
+                return match.group(1)
+        if candidate is not None:
+            return candidate  # Let the caller's parser report the details
+        raise ValueError("Could not extract a valid JSON block from the response.")
+
+    @staticmethod
+    def extract_object(raw_content: str) -> Dict:
+        """Extracts *and parses* the JSON object from a raw response.
+
+        The extract()/re-parse split made callers pay a second full parse
+        of the block extract() had just validated; this returns the parsed
+        object from the successful probe directly. Same path order as
+        extract(): direct parse, brace slice, fenced block.
+        """
+        trimmed = raw_content.strip()
+        try:
+            return _loads(trimmed)
+        except json.JSONDecodeError:
+            pass
+        start_brace = trimmed.find('{')
+        end_brace = trimmed.rfind('}')
+        candidate = trimmed[start_brace:end_brace + 1] if -1 < start_brace <= end_brace else None
+        if candidate is not None:
+            try:
+                return _loads(candidate)
+            except json.JSONDecodeError:
+                pass
+        if "```" in trimmed:
+            match = _JSON_FENCE_RE.search(trimmed)
+            if match:
+                return _loads(match.group(1))
+        if candidate is not None:
+            return _loads(candidate)  # Raises with the parser's details
         raise ValueError("Could not extract a valid JSON block from the response.")
 
 
 def call_ai_translation_api(
-        source_text: str, system_prompt: str, model_name: str
+        source_text: str,
+        system_prompt: str,
+        model_name: str,
+        session: Optional[requests.Session] = None,
 ) -> Optional[Dict[str, str]]:
     """Call the local AI API and parse the response."""
     api_url = os.getenv("AI_API_URL")
@@ -39,12 +262,105 @@ def call_ai_translation_api(
         logging.error("AI_API_URL environment variable must be set.")
         return None
 
+    # Identical source/prompt/model combinations short-circuit to the
+    # cache — repeated strings ("OK", "Cancel", ...) skip the network.
+    # Keys use whitespace-normalized text, so trivial variants of the
+    # same string also collapse onto one entry.
+    cache_key = _cache_key(_normalize_source_text(source_text), system_prompt, model_name)
+    cached = _cache_lookup(cache_key)
+    if cached is not None:
+        logging.debug("Translation cache hit; skipping API call.")
+        return cached
+
+    # Single-flight: when the same text is already being translated by
+    # another worker, wait for that result instead of duplicating the call.
+    with _single_flight_lock:
+        leader_event = _single_flight.get(cache_key)
+        if leader_event is None:
+            _single_flight[cache_key] = threading.Event()
+    if leader_event is not None:
+        leader_event.wait(SINGLE_FLIGHT_WAIT_S)
+        cached = _cache_lookup(cache_key)
+        if cached is not None:
+            logging.debug("Translation resolved by concurrent request.")
+            return cached
+        # The leader failed or timed out; fall through and call ourselves
+
+    # Fall back to the module-level API (one-off connection) when no
+    # pooled session is provided.
+    http = session if session is not None else requests
+
+    headers = {"Content-Type": "application/json"}
+    body = _get_payload_builder(system_prompt, model_name).build(f"{source_text} /no_think")
+
+    response_text = ""
+    start_time = time.monotonic()
+    try:
+        response = http.post(api_url, headers=headers, data=body, timeout=180)
+        duration = time.monotonic() - start_time
+        response_text = response.text
+        response.raise_for_status()
+
+        raw_content = response.json()["choices"][0]["message"]["content"]
+        translations = JsonExtractor.extract_object(raw_content)
+
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            pretty_json = json.dumps(translations, indent=2, ensure_ascii=False)
+            logging.debug(f"Successfully parsed AI response:\n{pretty_json}")
+
+        logging.info(f"API request succeeded in {duration:.2f} seconds.")
+        _cache_store(cache_key, translations)
+        return translations
+
+    except requests.exceptions.RequestException as e:
+        duration = time.monotonic() - start_time
+        logging.error(f"API request failed after {duration:.2f} seconds: {e}")
+    except (KeyError, IndexError, json.JSONDecodeError, ValueError, TypeError) as e:
+        duration = time.monotonic() - start_time
+        logging.error(f"Failed to parse API response after {duration:.2f}s: {e}. Raw: {response_text}")
+    finally:
+        # Wake any workers coalesced onto this request, on success or failure.
+        # Only the registering leader releases the entry; a follower that
+        # fell through must not clobber a newer leader's event.
+        if leader_event is None:
+            with _single_flight_lock:
+                event = _single_flight.pop(cache_key, None)
+            if event is not None:
+                event.set()
+
+    return None
+
+
+def call_ai_translation_batch_api(
+        source_texts: List[str],
+        system_prompt: str,
+        model_name: str,
+        session: Optional[requests.Session] = None,
+) -> Optional[List[Optional[Dict[str, str]]]]:
+    """Call the AI API once for several source texts.
+
+    The texts go out as one numbered JSON array, so the shared system
+    prompt is prefilled once per batch instead of once per item. The
+    response must be a JSON array with one flat translation object per
+    input (or an object keyed by the input ids).
+    """
+    api_url = os.getenv("AI_API_URL")
+    if not api_url:
+        logging.error("AI_API_URL environment variable must be set.")
+        return None
+
+    http = session if session is not None else requests
+
+    user_content = json.dumps(
+        [{"id": i, "text": text} for i, text in enumerate(source_texts)],
+        ensure_ascii=False,
+    )
     headers = {"Content-Type": "application/json"}
     payload = {
         "model": model_name,
         "messages": [
             {"role": "system", "content": system_prompt},
-            {"role": "user", "content": f"{source_text} /no_think"},
+            {"role": "user", "content": f"{user_content} /no_think"},
         ],
         "temperature": 0.2, "max_tokens": 8192, "stream": False,
     }
@@ -52,26 +368,60 @@ def call_ai_translation_api(
     response_text = ""
     start_time = time.monotonic()
     try:
-        response = requests.post(api_url, headers=headers, json=payload, timeout=180)
+        response = http.post(api_url, headers=headers, json=payload, timeout=300)
         duration = time.monotonic() - start_time
         response_text = response.text
         response.raise_for_status()
 
         raw_content = response.json()["choices"][0]["message"]["content"]
-        json_string = JsonExtractor.extract(raw_content)
-        translations = json.loads(json_string)
+        parsed = json.loads(_extract_json_array(raw_content))
 
-        pretty_json = json.dumps(translations, indent=2, ensure_ascii=False)
-        logging.debug(f"Successfully parsed AI response:\n{pretty_json}")
+        # Accept either an ordered array or an object keyed by id. A dict
+        # whose keys are not input ids (e.g. a flat translation object for
+        # one text) must fail loudly here so the caller's bisection retry
+        # runs — mapping it to a list of Nones would look like a clean
+        # batch with every item individually failed.
+        if isinstance(parsed, dict):
+            ids = [str(i) for i in range(len(source_texts))]
+            if not any(key in parsed for key in ids):
+                raise ValueError(
+                    "Batch response object is not keyed by input ids: "
+                    f"{list(parsed)[:5]}"
+                )
+            parsed = [parsed.get(key) for key in ids]
+        if not isinstance(parsed, list) or len(parsed) != len(source_texts):
+            raise ValueError(
+                f"Batch response has {len(parsed) if isinstance(parsed, list) else 'no'} "
+                f"entries for {len(source_texts)} inputs."
+            )
 
-        logging.info(f"API request succeeded in {duration:.2f} seconds.")
-        return translations
+        logging.info(f"Batch API request ({len(source_texts)} items) succeeded in {duration:.2f} seconds.")
+        return parsed
 
     except requests.exceptions.RequestException as e:
         duration = time.monotonic() - start_time
-        logging.error(f"API request failed after {duration:.2f} seconds: {e}")
+        logging.error(f"Batch API request failed after {duration:.2f} seconds: {e}")
     except (KeyError, IndexError, json.JSONDecodeError, ValueError, TypeError) as e:
         duration = time.monotonic() - start_time
-        logging.error(f"Failed to parse API response after {duration:.2f}s: {e}. Raw: {response_text}")
+        logging.error(f"Failed to parse batch API response after {duration:.2f}s: {e}. Raw: {response_text}")
+
+    return None
 
-    return None
\ No newline at end of file
+
+def _extract_json_array(raw_content: str) -> str:
+    """Like JsonExtractor.extract, but for a top-level JSON array or object."""
+    trimmed = raw_content.strip()
+    try:
+        json.loads(trimmed)
+        return trimmed
+    except json.JSONDecodeError:
+        pass
+    match = re.search(r"```json\s*([\[{].*?[\]}])\s*```", trimmed, re.DOTALL)
+    if match:
+        return match.group(1)
+    for open_char, close_char in (("[", "]"), ("{", "}")):
+        start = trimmed.find(open_char)
+        end = trimmed.rfind(close_char)
+        if start != -1 and end != -1 and end > start:
+            return trimmed[start:end + 1]
+    raise ValueError("Could not extract a valid JSON block from the response.")
@@ -1,28 +1,120 @@
 # File: ai_translator/state_manager.py
 import json
 import logging
+import os
+import re
 import shutil
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
+# Optional fast JSON codec, same convention as in processing.py: finalize
+# re-parses every .jsonl line and serializes the whole array, which is the
+# most JSON-bound step in the pipeline.
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def read_progress(progress_path: Path) -> int:
-    """Reads the last processed index from the .progress file."""
+# Line parser for the finalize loop (orjson and json both accept bytes)
+_loads = orjson.loads if orjson is not None else json.loads
+
+# Fast path for pulling the source index off a .jsonl line: the writer
+# always emits "__idx" as the first key, so a prefix match avoids parsing
+# the whole line during the indexing pass.
+_IDX_PREFIX = re.compile(rb'^\{"__idx":(\d+)[,}]')
+
+
+def _dumps_element(item: Any) -> bytes:
+    """Serializes one array element as indented UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(item, option=orjson.OPT_INDENT_2)
+    return json.dumps(item, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _index_jsonl(jsonl_path: Path) -> Dict[int, Tuple[int, int]]:
+    """Maps source index -> (byte offset, length) for every .jsonl line.
+
+    Only the index needs to live in memory, never the items themselves;
+    a duplicate index (re-run after resume) keeps the last line. Lines
+    without the "__idx" prefix (older runs) are numbered by position.
+    """
+    index: Dict[int, Tuple[int, int]] = {}
+    fallback_idx = 0
+    offset = 0
+    with open(jsonl_path, "rb") as f:
+        for line in f:
+            length = len(line)
+            if line.strip():
+                match = _IDX_PREFIX.match(line)
+                if match:
+                    idx = int(match.group(1))
+                else:
+                    idx = _loads(line).get("__idx", fallback_idx)
+                fallback_idx = idx + 1
+                index[idx] = (offset, length)
+            offset += length
+    return index
+
+
+def read_progress(
+        progress_path: Path,
+        source_mtime_ns: Optional[int] = None
+) -> Tuple[int, Optional[int]]:
+    """Reads (next index, total item count if known) from the .progress file.
+
+    The total is only present once a previous run exhausted the source
+    stream; a resume with next >= total can finalize without re-reading
+    the source at all. A recorded source mtime that no longer matches
+    invalidates the sidecar (the file was swapped out underneath us).
+    Legacy sidecars holding a bare integer are still accepted.
+    """
     if not progress_path.exists():
-        return 0
+        return 0, None
     try:
         with open(progress_path, "r") as f:
-            return int(f.read().strip())
-    except (IOError, ValueError):
+            raw = f.read().strip()
+        if raw.startswith("{"):
+            state = json.loads(raw)
+            recorded_mtime = state.get("source_mtime_ns")
+            if (
+                    recorded_mtime is not None
+                    and source_mtime_ns is not None
+                    and recorded_mtime != source_mtime_ns
+            ):
+                logging.warning(
+                    f"Source file changed since {progress_path.name} was written. Starting from 0."
+                )
+                return 0, None
+            return int(state["next"]), state.get("total")
+        return int(raw), None
+    except (IOError, ValueError, KeyError, json.JSONDecodeError):
         logging.error(f"Could not read progress file {progress_path.name}. Starting from 0.")
-        return 0
+        return 0, None
+
 
+def write_progress(
+        progress_path: Path,
+        index: int,
+        total: Optional[int] = None,
+        source_mtime_ns: Optional[int] = None
+) -> None:
+    """Writes the next index (and total count, once known) to the .progress file.
 
-def write_progress(progress_path: Path, index: int) -> None:
-    """Writes the next index to be processed to the .progress file."""
+    The write goes to a temp file, is fsync'd, and is then atomically
+    renamed into place so a crash can never leave a torn progress file.
+    """
+    state: Dict[str, int] = {"next": index}
+    if total is not None:
+        state["total"] = total
+    if source_mtime_ns is not None:
+        state["source_mtime_ns"] = source_mtime_ns
+    tmp_path = progress_path.with_suffix(".progress.tmp")
     try:
-        with open(progress_path, "w") as f:
-            f.write(str(index))
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, progress_path)
     except IOError as e:
         logging.error(f"Could not write to progress file {progress_path.name}: {e}")
 
@@ -41,7 +133,6 @@ def finalize_and_cleanup(
     # Use a temporary file in the final destination for atomicity
     temp_final_path = final_target_path.with_suffix(".json.final")
 
-    processed_data = []
     try:
         if not jsonl_path.exists():
             logging.warning(f"No .jsonl data found for {processing_path.name}. Moving original file to done.")
@@ -49,12 +140,29 @@ def finalize_and_cleanup(
             if progress_path.exists(): progress_path.unlink()
             return True
 
-        with open(jsonl_path, "r", encoding="utf-8") as f:
-            for line in f:
-                processed_data.append(json.loads(line))
+        # Lines are appended in completion order, tagged with their source
+        # index. Pass 1 builds an index -> (offset, length) map; pass 2
+        # seeks each line in sorted order and streams it to the output,
+        # so peak memory is one line, not the whole file.
+        line_index = _index_jsonl(jsonl_path)
 
-        with open(temp_final_path, "w", encoding="utf-8") as f:
-            json.dump(processed_data, f, indent=2, ensure_ascii=False)
+        with open(jsonl_path, "rb") as src, open(temp_final_path, "wb") as out:
+            out.write(b"[\n")
+            first = True
+            for idx in sorted(line_index):
+                offset, length = line_index[idx]
+                src.seek(offset)
+                item = _loads(src.read(length))
+                item.pop("__idx", None)
+                if "__raw" in item and len(item) == 1:
+                    # Non-object source entry wrapped by the writer; emit
+                    # the original value exactly as it appeared.
+                    item = item["__raw"]
+                if not first:
+                    out.write(b",\n")
+                out.write(_dumps_element(item))
+                first = False
+            out.write(b"\n]\n")
 
         # Atomically move the final file into place
         shutil.move(temp_final_path, final_target_path)
@@ -1,56 +1,263 @@
 # File: ai_translator/tuner.py
+import json
 import logging
+import math
+import os
+import threading
 import time
+from collections import deque
+from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import TYPE_CHECKING, Any, Dict, List, Tuple
-from statistics import mean
+from itertools import count
+from statistics import mean, stdev
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 
 if TYPE_CHECKING:
     from ai_translator.processing import FileProcessor
 
 # --- CONFIG ------------------------------------------------------------
 TUNE_MEASURE_DURATION = 5  # seconds per test round
+TUNE_MIN_SAMPLES = 30  # completions a round needs before its number is trusted
+TUNE_MAX_DURATION_FACTOR = 3  # hard cap: rounds never exceed base duration x this
 TUNE_IMPROVEMENT_THRESHOLD = 0.99  # require +1% improvement to continue
 TUNE_VALIDATION_REPEAT = True  # revalidate plateau worker to confirm
+MAX_TUNE_WORKERS = 512  # ceiling of the shared pool (largest candidate)
+TUNE_EMA_ALPHA = 0.4  # weight of the newest throughput sample
+TUNE_EMA_PATIENCE = 2  # non-positive smoothed-slope rounds before stopping
+TUNE_WARMUP_WINDOW = 5  # trailing runtimes considered for stability
+TUNE_WARMUP_CV = 0.05  # coefficient of variation treated as steady state
+TUNE_WARMUP_MIN = 5  # items always run before checking stability
+TUNE_WARMUP_MAX = 30  # hard cap on warmup items
+TUNE_GSS_TOLERANCE = 2  # stop narrowing once the bracket is this tight
+TUNE_CACHE_PATH = Path.home() / ".cache" / "ai_translator" / "tuner.json"
+TUNE_CACHE_TTL_S = float(os.getenv("AI_TRANSLATOR_TUNE_TTL", 7 * 24 * 3600))
 
 
 # ----------------------------------------------------------------------
 
 
+def _candidate_workers() -> List[int]:
+    """Coarse candidates scaled from the host's CPU count.
+
+    The old literal list probed up to 512 workers even on a 4-core
+    laptop, where the top counts only add context-switch noise. Even for
+    this IO-bound workload the useful range tracks the core count, so
+    candidates are core multiples from 0.25x to 32x, capped at the shared
+    pool's ceiling.
+    """
+    cores = os.cpu_count() or 4
+    factors = (0.25, 0.5, 1, 2, 3, 4, 6, 8, 12, 16, 24, 32)
+    return sorted({
+        min(max(int(cores * f), 1), MAX_TUNE_WORKERS) for f in factors
+    })
+
+
 class WorkerTuner:
     """Finds the optimal number of workers for current hardware."""
 
-    def __init__(self, processor: 'FileProcessor'):
+    def __init__(
+            self,
+            processor: 'FileProcessor',
+            refill: Optional[Callable[[], List[Tuple[int, Dict[str, Any]]]]] = None
+    ):
         self.processor = processor
+        # One long-lived pool shared by every test round: threads are spawned
+        # lazily up to the largest gate used, then reused, instead of paying
+        # pool construction and teardown per candidate. A Semaphore per round
+        # caps effective parallelism at the candidate under test.
+        self._pool: Optional[ThreadPoolExecutor] = None
+        # Tuning rounds translate their items in place, so the initial
+        # sample is consumed as rounds run. `refill` supplies more
+        # untranslated items from the caller's stream; without it a long
+        # tuning session runs dry and later candidates measure nothing.
+        self._refill = refill
+        self._items: "deque[Tuple[int, Dict[str, Any]]]" = deque()
+
+    def _next_item(self) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """Pops the next untranslated item, refilling the pool as needed."""
+        if not self._items and self._refill is not None:
+            fresh = self._refill()
+            if fresh:
+                self._items.extend(fresh)
+            else:
+                self._refill = None  # Stream exhausted; stop asking
+        return self._items.popleft() if self._items else None
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            # Same reduced stack as the main pool: tuning threads only do
+            # shallow HTTP calls, and at 512 of them the default 8 MB
+            # stack reservation would dominate the tuner's footprint.
+            # (Imported here to avoid a cycle — processing imports tuner.)
+            from ai_translator.processing import WORKER_STACK_SIZE
+            try:
+                threading.stack_size(WORKER_STACK_SIZE)
+            except (ValueError, RuntimeError):
+                pass  # Platform minimum not met; keep the default
+            self._pool = ThreadPoolExecutor(max_workers=MAX_TUNE_WORKERS)
+        return self._pool
+
+    def close(self) -> None:
+        """Shuts down the shared tuning pool (tuning threads are not needed
+        once the main job's own pool takes over)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    # ------------------------------------------------------------
+    # Cached tuning results, reused across runs
+    # ------------------------------------------------------------
+    def _cache_key(self) -> str:
+        """Key under which a tuned worker count is stored.
+
+        Model, endpoint and CPU count cover everything the optimum
+        depends on; a change to any of them invalidates the entry.
+        """
+        model = getattr(self.processor.args, "model", "")
+        endpoint = os.getenv("AI_API_URL", "")
+        return f"{model}|{endpoint}|{os.cpu_count()}"
+
+    def _load_cached_workers(self) -> Optional[int]:
+        """Returns a fresh cached worker count, or None."""
+        try:
+            with open(TUNE_CACHE_PATH, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            entry = entries[self._cache_key()]
+            if time.time() - entry["timestamp"] <= TUNE_CACHE_TTL_S:
+                return int(entry["best_workers"])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+
+    def _store_cached_workers(self, best_workers: int) -> None:
+        """Persists the tuned worker count for future runs (best effort)."""
+        try:
+            try:
+                with open(TUNE_CACHE_PATH, "r", encoding="utf-8") as f:
+                    entries = json.load(f)
+            except (OSError, ValueError):
+                entries = {}
+            entries[self._cache_key()] = {
+                "best_workers": best_workers,
+                "timestamp": time.time(),
+            }
+            TUNE_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = TUNE_CACHE_PATH.with_suffix(".json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f, indent=2)
+            os.replace(tmp_path, TUNE_CACHE_PATH)
+        except OSError as e:
+            logging.debug(f"Could not persist tuning result: {e}")
+
+    # ------------------------------------------------------------
+    # Warmup until per-item runtime is stable
+    # ------------------------------------------------------------
+    def _warmup_until_stable(self) -> None:
+        """Runs items serially until the runtime coefficient of variation
+        settles below TUNE_WARMUP_CV (bounded by TUNE_WARMUP_MIN/MAX).
+
+        A fixed one-item warmup left cold HTTP connections and model
+        load biasing the first candidate's measurement low; measuring
+        stability directly removes that bias without over-warming.
+        """
+        runtimes: deque = deque(maxlen=TUNE_WARMUP_WINDOW)
+        done = 0
+        cv = float("inf")
+        while done < TUNE_WARMUP_MAX:
+            item_tuple = self._next_item()
+            if item_tuple is None:
+                break  # Pool and stream exhausted
+            start = time.monotonic()
+            self.processor._process_single_item(item_tuple)
+            runtimes.append(time.monotonic() - start)
+            done += 1
+            if done >= TUNE_WARMUP_MIN and len(runtimes) >= 2:
+                avg = mean(runtimes)
+                cv = stdev(runtimes) / avg if avg > 0 else float("inf")
+                if cv < TUNE_WARMUP_CV:
+                    break
+        logging.info(f"🔥 Warmup done after {done} item(s) (runtime CV {cv:.3f}).")
 
     # ------------------------------------------------------------
     # Internal helper: run one timed batch
     # ------------------------------------------------------------
-    def _run_chunk(self, items: List[Tuple[int, Dict[str, Any]]], num_workers: int) -> Tuple[int, float]:
-        """Process as many items as possible in the defined measurement window."""
-        processed_count = 0
-        start_time = time.monotonic()
+    def _run_chunk(self, num_workers: int) -> Tuple[int, float]:
+        """Process as many pool items as possible in the measurement window.
+
+        Consumes from the refillable item pool so every round measures
+        real translations; items a previous round already translated are
+        never re-fed as no-op work.
+        """
+        # itertools.count increments in C under a single bytecode, so
+        # hundreds of workers can bump it without the read-modify-write
+        # races and cache ping-pong of a shared Python int.
+        translated = count()
+        # Local bindings: every task pays these lookups otherwise, and the
+        # tuner's own dispatch overhead inflates its own measurements.
+        monotonic = time.monotonic
+        process_item = self.processor._process_single_item
+        gate = threading.Semaphore(num_workers)
+        gate_release = gate.release
+
+        start_time = monotonic()
         cutoff_time = start_time + TUNE_MEASURE_DURATION
+        hard_cutoff = start_time + TUNE_MEASURE_DURATION * TUNE_MAX_DURATION_FACTOR
 
         def timed_task(item_tuple):
-            nonlocal processed_count
-            if time.monotonic() > cutoff_time:
-                return
-            _, item, status = self.processor._process_single_item(item_tuple)
-            if status == "translated":
-                processed_count += 1
-
-        with ThreadPoolExecutor(max_workers=num_workers) as executor:
-            futures = {executor.submit(timed_task, item) for item in items}
-            for f in as_completed(futures):
-                if time.monotonic() > cutoff_time:
+            try:
+                if monotonic() > cutoff_time:
+                    return
+                _, item, status = process_item(item_tuple)
+                if status == "translated":
+                    next(translated)
+            finally:
+                gate_release()
+
+        executor = self._get_pool()
+        submit = executor.submit
+        gate_acquire = gate.acquire
+        next_item = self._next_item
+        futures = []
+        append = futures.append
+        while True:
+            # The gate bounds in-flight tasks to the candidate under test,
+            # and doubles as backpressure for the submission loop.
+            gate_acquire()
+            if monotonic() > cutoff_time:
+                # A slow low-worker round may have finished only a handful
+                # of items — too noisy to compare against the fast rounds.
+                # Extend the window (bounded by hard_cutoff) until enough
+                # samples are in; items_per_min divides by the real
+                # duration, so extended rounds stay comparable.
+                # __reduce__ peeks the counter without consuming a tick.
+                if (translated.__reduce__()[1][0] < TUNE_MIN_SAMPLES
+                        and cutoff_time < hard_cutoff):
+                    cutoff_time = min(cutoff_time + TUNE_MEASURE_DURATION, hard_cutoff)
+                else:
+                    gate_release()
                     break
-                try:
-                    f.result()  # Check for exceptions
-                except Exception as e:
-                    logging.error(f"[TUNER_ERROR] Task failed during test: {e}")
-
-        duration = time.monotonic() - start_time
+            item = next_item()
+            if item is None:
+                gate_release()
+                break  # Pool and stream exhausted
+            append(submit(timed_task, item))
+        for f in as_completed(futures):
+            if monotonic() > cutoff_time:
+                break
+            try:
+                f.result()  # Check for exceptions
+            except Exception as e:
+                logging.error(f"[TUNER_ERROR] Task failed during test: {e}")
+
+        # Cancel anything still queued: a leftover task that starts after
+        # the cutoff would keep translating into the next candidate's
+        # measurement window. Tasks already running return early via the
+        # cutoff check in timed_task.
+        for f in futures:
+            f.cancel()
+
+        duration = monotonic() - start_time
+        processed_count = next(translated)  # next() returns how many came before it
         items_per_min = (processed_count / duration) * 60 if duration > 0 else 0
         return processed_count, items_per_min
 
@@ -58,12 +265,19 @@ class WorkerTuner:
     # ASCII table for results
     # ------------------------------------------------------------
     def _print_table(self, history: List[Dict[str, Any]]):
-        logging.info("")
-        logging.info("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-        logging.info(f"{'Workers':>8} │ {'Items/min':>10} │ {'Δ vs prev':>10} │ {'Δ vs best':>10}")
-        logging.info("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        # Built as one string and logged once: each logging call takes the
+        # handler lock, and under --file-workers interleaved per-row logs
+        # from other processes would shred the table.
+        rule = "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+        lines = [
+            "",
+            rule,
+            f"{'Workers':>8} │ {'Items/min':>10} │ {'Δ vs prev':>10} │ {'Δ vs best':>10}",
+            rule,
+        ]
 
         if not history:
+            logging.info("\n".join(lines))
             logging.warning("No tuning history recorded.")
             return
 
@@ -74,15 +288,17 @@ class WorkerTuner:
         if best == 0:
             logging.warning("Tuning resulted in zero throughput.")
             best = 1  # Avoid division by zero
+        inv_best = 1.0 / best
 
         for i, h in enumerate(history):
             delta_prev = (
                 f"{(h['items_per_min'] / history[i - 1]['items_per_min'] - 1) * 100:+.1f}%"
                 if i > 0 and history[i - 1]['items_per_min'] > 0 else "base"
             )
-            delta_best = f"{(h['items_per_min'] / best - 1) * 100:+.1f}%"
-            logging.info(f"{h['workers']:>8} │ {h['items_per_min']:>10.1f} │ {delta_prev:>10} │ {delta_best:>10}")
-        logging.info("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+            delta_best = f"{(h['items_per_min'] * inv_best - 1) * 100:+.1f}%"
+            lines.append(f"{h['workers']:>8} │ {h['items_per_min']:>10.1f} │ {delta_prev:>10} │ {delta_best:>10}")
+        lines.append(rule)
+        logging.info("\n".join(lines))
 
     # ------------------------------------------------------------
     # --- FIX: Phase 2: Binary Search Fine-Tuning (NEW) ---
@@ -91,13 +307,23 @@ class WorkerTuner:
             self,
             w_count: int,
             tested_results: Dict[int, float],
-            items_to_process: List[Tuple[int, Dict[str, Any]]],
             history: List[Dict[str, Any]]
-    ) -> float:
-        """Helper to run a test or retrieve a cached result."""
+    ) -> Optional[float]:
+        """Helper to run a test or retrieve a cached result.
+
+        Returns None when the probe completed fewer than TUNE_MIN_SAMPLES
+        items (stream exhausted) — such a measurement is noise and must
+        not be recorded or compared.
+        """
         if w_count not in tested_results:
             logging.info(f"🔎  Testing {w_count} workers...")
-            processed, items_per_min = self._run_chunk(items_to_process, w_count)
+            processed, items_per_min = self._run_chunk(w_count)
+            if processed < TUNE_MIN_SAMPLES:
+                logging.warning(
+                    f"🔎  {w_count} workers → only {processed} completion(s) — "
+                    "out of tuning items; discarding this probe."
+                )
+                return None
 
             tested_results[w_count] = items_per_min
             history.append({
@@ -109,23 +335,37 @@ class WorkerTuner:
 
         return tested_results[w_count]
 
-    def _run_fine_tuning_bisection(
+    def _run_fine_tuning_gss(
             self,
-            items_to_process: List[Tuple[int, Dict[str, Any]]],
             history: List[Dict[str, Any]],
             best_workers: int,
             best_items_per_min: float
     ) -> Tuple[int, float]:
         """
-        Runs a binary search for the peak performance.
+        Golden-section search for the throughput peak inside the coarse bracket.
+
+        Assuming throughput(workers) is unimodal within the bracket, each
+        iteration reuses one interior probe and measures only one new
+        worker count — half the cost of the old bisection, which measured
+        mid and mid+1 every step. Probes are cached, so revisited counts
+        are free.
         """
-        logging.info("")
-        logging.info("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-        logging.info(f"🔎  Phase 2: Fine-tuning (Binary Search) around {best_workers} workers...")
-        logging.info("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        rule = "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+        logging.info(
+            f"\n{rule}\n"
+            f"🔎  Phase 2: Fine-tuning (Golden-Section Search) around {best_workers} workers...\n"
+            f"{rule}"
+        )
 
-        # Create a map of all results we already have
-        tested_results: Dict[int, float] = {h["workers"]: h["items_per_min"] for h in history}
+        # Create a map of all results we already have. Plateau re-tests
+        # append a second entry for the same worker count, so aggregate
+        # duplicates by max — a last-wins comprehension would let a noisy
+        # re-run erase a genuine better measurement and flip the answer.
+        tested_results: Dict[int, float] = {}
+        for h in history:
+            speed = h["items_per_min"]
+            if speed > tested_results.get(h["workers"], -1.0):
+                tested_results[h["workers"]] = speed
 
         # Find the bounds for our search
         try:
@@ -143,83 +383,132 @@ class WorkerTuner:
 
         logging.info(f"🔎  Searching for peak in range [{low_bound}, {high_bound}]...")
 
-        # Keep track of the best result found during this fine-tuning
-        best_fine_workers = best_workers
-        best_fine_speed = best_items_per_min
-
-        # Implement binary search for the peak
-        low = low_bound
-        high = high_bound
-
-        while low <= high:
-            mid = (low + high) // 2
-            if mid == 0: break  # Safety break
-
-            # Test mid
-            mid_speed = self._get_speed(mid, tested_results, items_to_process, history)
-            if mid_speed > best_fine_speed:
-                best_fine_speed = mid_speed
-                best_fine_workers = mid
-
-            # We need to test one neighbor to know which way to go
-            mid_plus_1_speed = self._get_speed(mid + 1, tested_results, items_to_process, history)
-            if mid_plus_1_speed > best_fine_speed:
-                best_fine_speed = mid_plus_1_speed
-                best_fine_workers = mid + 1
-
-            # Decide which half to discard
-            if mid_speed < mid_plus_1_speed:
-                # The peak is to the right
-                low = mid + 2  # We already tested mid and mid+1
+        inv_phi = (math.sqrt(5) - 1) / 2
+        a, b = low_bound, high_bound
+        c = round(b - inv_phi * (b - a))
+        d = round(a + inv_phi * (b - a))
+
+        while b - a > TUNE_GSS_TOLERANCE and c < d:
+            speed_c = self._get_speed(c, tested_results, history)
+            speed_d = self._get_speed(d, tested_results, history)
+            if speed_c is None or speed_d is None:
+                logging.warning("Out of tuning items — stopping fine-tuning with the probes taken so far.")
+                break
+            if speed_c >= speed_d:
+                # Peak is in [a, d]; c becomes the reused interior probe
+                b, d = d, c
+                c = round(b - inv_phi * (b - a))
             else:
-                # The peak is to the left (or at mid)
-                high = mid - 1
+                # Peak is in [c, b]; d becomes the reused interior probe
+                a, c = c, d
+                d = round(a + inv_phi * (b - a))
 
-        logging.info(f"🔎  Binary search complete. Best fine-tuned result: {best_fine_workers} workers.")
+        # Every probe (coarse and fine) is in tested_results; the measured
+        # maximum is the answer, wherever a phase found it.
+        best_fine_workers = max(tested_results, key=tested_results.get)
+        best_fine_speed = tested_results[best_fine_workers]
+
+        logging.info(f"🔎  Golden-section search complete. Best fine-tuned result: {best_fine_workers} workers.")
         return best_fine_workers, best_fine_speed
 
     # ------------------------------------------------------------
     # Main auto-tune entrypoint
     # ------------------------------------------------------------
     def auto_tune(self, items_to_process: List[Tuple[int, Dict[str, Any]]]) -> int:
+        self._items = deque(items_to_process)
+        try:
+            return self._auto_tune()
+        finally:
+            self.close()
+
+    def _auto_tune(self) -> int:
+        # A fresh cached result for this model/endpoint/CPU skips both
+        # phases; one revalidation round makes sure the endpoint still
+        # delivers before trusting it.
+        cached_workers = self._load_cached_workers()
+        if cached_workers is not None:
+            logging.info(f"⚙️  Reusing tuned worker count {cached_workers} from {TUNE_CACHE_PATH}.")
+            self._warmup_until_stable()
+            processed, items_per_min = self._run_chunk(cached_workers)
+            if processed > 0:
+                logging.info(
+                    f"🏁  Cached tuning validated: {cached_workers} workers → {items_per_min:.1f} items/min."
+                )
+                return cached_workers
+            logging.warning("Cached worker count produced no throughput — re-tuning from scratch.")
+
         logging.info("⚙️  --- Phase 1: Starting worker auto-tuning (Coarse) ---")
-        logging.info("🔥 Running warmup batch to stabilize model...")
-        warmup_items = items_to_process[:1]  # Use 1 item for warmup
-        self._run_chunk(warmup_items, 1)
+        logging.info("🔥 Running warmup until throughput stabilizes...")
+        if cached_workers is None:
+            self._warmup_until_stable()
 
-        worker_candidates = [1, 2, 4, 8, 12, 16, 24, 32, 48, 64, 96, 128, 256, 512]
+        worker_candidates = _candidate_workers()
+        logging.info(f"⚙️  Worker candidates for this host: {worker_candidates}")
         history: List[Dict[str, Any]] = []
 
         best_workers = 1
         best_items_per_min = 0
 
+        # EWMA of the throughput curve: a single noisy regression no longer
+        # ends the sweep; the smoothed slope must stay non-positive for
+        # TUNE_EMA_PATIENCE consecutive rounds before we call it saturated.
+        ema = None
+        flat_rounds = 0
+
         for workers in worker_candidates:
-            processed, items_per_min = self._run_chunk(items_to_process, workers)
+            processed, items_per_min = self._run_chunk(workers)
+            if processed < TUNE_MIN_SAMPLES:
+                # Extension only helps while the clock is the limit; when
+                # the item stream runs out the round ends early with too
+                # few completions, and its number is noise, not signal.
+                logging.warning(
+                    f"⚙️  {workers} workers → only {processed} completion(s) — "
+                    "out of tuning items; discarding this round and ending the coarse sweep."
+                )
+                break
             history.append({
                 "workers": workers,
                 "items_per_min": items_per_min,
                 "processed": processed,
             })
 
-            avg_last = mean([h["items_per_min"] for h in history[-2:]]) if len(history) > 1 else items_per_min
+            prev_ema = ema
+            ema = (
+                items_per_min if ema is None
+                else TUNE_EMA_ALPHA * items_per_min + (1 - TUNE_EMA_ALPHA) * ema
+            )
 
             logging.info("")
             logging.info(f"⚙️  {workers} workers → {items_per_min:.1f} items/min ({processed} processed)")
-            logging.info(f"⚙️  Current average: {avg_last:.1f} items/min")
+            logging.info(f"⚙️  Smoothed throughput: {ema:.1f} items/min")
 
-            # Improvement check
             if items_per_min > best_items_per_min * TUNE_IMPROVEMENT_THRESHOLD:
                 best_items_per_min = max(best_items_per_min, items_per_min)
                 best_workers = workers
+
+            # Trend check on the smoothed curve
+            if prev_ema is not None and ema <= prev_ema:
+                flat_rounds += 1
             else:
+                flat_rounds = 0
+
+            if flat_rounds >= TUNE_EMA_PATIENCE:
                 # Plateau detected → optional validation
-                logging.info("")
-                logging.info("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-                logging.info("📉  Performance plateau detected — validating best worker again...")
-                logging.info("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+                rule = "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+                logging.info(
+                    f"\n{rule}\n"
+                    f"📉  Performance plateau detected — validating best worker again...\n"
+                    f"{rule}"
+                )
 
                 if TUNE_VALIDATION_REPEAT:
-                    _, recheck_speed = self._run_chunk(items_to_process, best_workers)
+                    recheck_processed, recheck_speed = self._run_chunk(best_workers)
+                    if recheck_processed < TUNE_MIN_SAMPLES:
+                        logging.warning(
+                            f"⚙️  Re-test finished only {recheck_processed} completion(s) — "
+                            "discarding it and keeping the earlier measurement."
+                        )
+                        break
                     if recheck_speed >= best_items_per_min * (TUNE_IMPROVEMENT_THRESHOLD ** 2):  # Loosen threshold
                         logging.info("")
                         logging.info("✅ Plateau confirmed after re-test. Proceeding to fine-tuning.")
@@ -227,14 +516,18 @@ class WorkerTuner:
                     else:
                         logging.info("🌀 Re-test showed better results, continuing coarse search...")
                         best_items_per_min = recheck_speed
-                        history.append({"workers": best_workers, "items_per_min": recheck_speed, "processed": 0})
+                        history.append({
+                            "workers": best_workers,
+                            "items_per_min": recheck_speed,
+                            "processed": recheck_processed,
+                        })
+                        flat_rounds = 0
                         continue
                 else:
                     break
 
-        # --- FIX: Run Phase 2 (Binary Search Fine-Tuning) ---
-        best_workers, best_items_per_min = self._run_fine_tuning_bisection(
-            items_to_process,
+        # --- FIX: Run Phase 2 (Golden-Section Fine-Tuning) ---
+        best_workers, best_items_per_min = self._run_fine_tuning_gss(
             history,
             best_workers,
             best_items_per_min
@@ -243,10 +536,8 @@ class WorkerTuner:
         # Final table
         self._print_table(history)
 
-        # Triple log for visibility
-        logging.info("")
-        logging.info(f"🏁🏁🏁  Optimal workers ≈ {best_workers} → {best_items_per_min:.1f} items/min 🚀🚀🚀")
-        logging.info(f"🏁🏁🏁  Optimal workers ≈ {best_workers} → {best_items_per_min:.1f} items/min 🚀🚀🚀")
-        logging.info(f"🏁🏁🏁  Optimal workers ≈ {best_workers} → {best_items_per_min:.1f} items/min 🚀🚀🚀")
-        logging.info("")
+        # Triple banner for visibility, formatted and emitted once
+        banner = f"🏁🏁🏁  Optimal workers ≈ {best_workers} → {best_items_per_min:.1f} items/min 🚀🚀🚀"
+        logging.info("\n" + "\n".join([banner] * 3) + "\n")
+        self._store_cached_workers(best_workers)
         return best_workers
\ No newline at end of file
@@ -1,21 +1,67 @@
 # File: ai_translator/utils.py
+import errno
+import os
+import shutil
+from functools import lru_cache
+from pathlib import Path
 from typing import Any, Dict, Optional, Tuple
 
+
+def move_file(source: Path, destination: Path) -> None:
+    """Moves a file with a single rename syscall where possible.
+
+    os.replace is one renameat call on the same filesystem; only a true
+    cross-device move falls back to shutil.move's copy+unlink path.
+    """
+    try:
+        os.replace(source, destination)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(str(source), str(destination))
+
 # Language priority for finding a source text
 SOURCE_LANG_PRIORITY = ["de", "en", "fr"]
 
+# Immutable copy iterated on the per-item hot path
+_PRIORITY_TUPLE = tuple(SOURCE_LANG_PRIORITY)
+
+
+@lru_cache(maxsize=4)
+def _read_prompt(path_str: str, mtime_ns: int) -> str:
+    """Reads and decodes a prompt file; cached per (path, mtime) pair."""
+    with open(path_str, "rb") as f:
+        return f.read().decode("utf-8")
+
+
+def load_system_prompt(path: Path) -> str:
+    """Returns the system prompt text, re-reading only when the file changed.
+
+    The mtime is part of the cache key, so repeated loads in the job loop
+    are free while an edited prompt file is still picked up.
+    """
+    return _read_prompt(str(path), path.stat().st_mtime_ns)
+
 
 def is_language_key(key: str) -> bool:
     """Check if a key is a 2-letter language code."""
     return len(key) == 2
 
 
-def get_source_language(item: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+def get_source_language(
+        item: Dict[str, Any],
+        _priority: Tuple[str, ...] = _PRIORITY_TUPLE
+) -> Optional[Tuple[str, str]]:
     """Finds the best available source language based on priority."""
-    for lang in SOURCE_LANG_PRIORITY:
-        if item.get(lang) and is_language_key(lang):
-            return lang, item[lang]
-    for lang, text in item.items():
-        if is_language_key(lang) and text:
+    # The priority constants are known 2-letter codes, so no key check here.
+    # Bound as a default argument: resolved once at def time instead of a
+    # module-global lookup on every call.
+    for lang in _priority:
+        text = item.get(lang)
+        if text:
             return lang, text
-    return None
\ No newline at end of file
+    # Fallback: first non-empty language value, short-circuiting via next()
+    return next(
+        ((lang, text) for lang, text in item.items() if len(lang) == 2 and text),
+        None,
+    )
\ No newline at end of file